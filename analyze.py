@@ -3,196 +3,323 @@
 Statistics and analysis tool for the Parallel Web Crawler
 """
 
+import io
+import os
 import sqlite3
 import sys
 import argparse
+import json
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, List
 from urllib.parse import urlparse
 
-def analyze_database(db_path: str):
-    """Analyze crawl results and generate detailed statistics"""
+# Rows fetched per round trip when streaming exports
+EXPORT_BATCH_SIZE = 1000
+
+# Columns written by export_results, in output order
+EXPORT_COLUMNS = ['url', 'title', 'content_length', 'status', 'depth', 'timestamp', 'domain', 'response_time']
+
+# One JSON export record in json.dump(..., indent=2) layout; each %s is a
+# json.dumps()-encoded column value, so no per-row dict is needed
+JSON_RECORD_TEMPLATE = '{\n' + ',\n'.join(
+    f'    {json.dumps(column)}: %s' for column in EXPORT_COLUMNS
+) + '\n  }'
+
+def connect_database(db_path: str) -> sqlite3.Connection:
+    """Open the crawl database read-only, tuned for large read-heavy scans"""
+    # This connection never writes; create_report_indexes() opens its own
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    
+    # 256 MB page cache, memory-mapped reads and in-memory temp tables keep
+    # repeated aggregation scans out of read() syscalls
+    conn.execute('PRAGMA cache_size=-262144')
+    conn.execute(f'PRAGMA mmap_size={1 << 31}')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    
+    return conn
+
+# Indexes backing the report queries below that the crawler does not
+# create; the status/depth and per-domain queries read DatabaseManager's
+# idx_depth_status and idx_domain_size. EXPLAIN QUERY PLAN shows every
+# query except largest_pages reading only the index
+REPORT_INDEXES = [
+    # Response times of successful pages; largest_pages also seeks here and
+    # walks sizes in order, reading the table only for the 10 rows it returns
+    'CREATE INDEX IF NOT EXISTS idx_status_size ON crawled_urls(status, content_length, response_time)',
+    # Error summary only ever looks at failed rows
+    "CREATE INDEX IF NOT EXISTS idx_error_status ON crawled_urls(error_message, status) WHERE status != 'success'",
+]
+
+# Report indexes superseded by the ones above
+OBSOLETE_REPORT_INDEXES = ['idx_success_size', 'idx_err']
+
+def create_report_indexes(db_path: str) -> bool:
+    """
+    Create REPORT_INDEXES if the database can be written
+    
+    The report runs without them, only slower, so a read-only database is
+    reported on as it is instead of failing. The indexes persist in the
+    file, so once a report has run, every later crawl into the same
+    database also pays to maintain them on each insert.
+    
+    Args:
+        db_path: Path to SQLite database file
+        
+    Returns:
+        bool: True if the indexes are in place
+    """
+    if not os.access(db_path, os.W_OK):
+        return False
     
     try:
         conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        print("=" * 60)
-        print("PARALLEL WEB CRAWLER - ANALYSIS REPORT")
-        print("=" * 60)
-        print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Database: {db_path}")
-        print()
-        
-        # Basic statistics
-        cursor.execute('SELECT COUNT(*) FROM crawled_urls')
-        total_urls = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(DISTINCT domain) FROM crawled_urls')
-        unique_domains = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT AVG(content_length) FROM crawled_urls WHERE status = "success"')
-        avg_content_length = cursor.fetchone()[0] or 0
-        
-        cursor.execute('SELECT SUM(content_length) FROM crawled_urls WHERE status = "success"')
-        total_content = cursor.fetchone()[0] or 0
-        
-        print(f"📊 OVERALL STATISTICS")
-        print(f"   Total URLs processed: {total_urls:,}")
-        print(f"   Unique domains: {unique_domains:,}")
-        print(f"   Average page size: {avg_content_length:.0f} bytes")
-        print(f"   Total content crawled: {total_content / (1024*1024):.2f} MB")
-        print()
-        
-        # Status breakdown
-        cursor.execute('SELECT status, COUNT(*) FROM crawled_urls GROUP BY status ORDER BY COUNT(*) DESC')
-        status_counts = cursor.fetchall()
-        
-        print(f"📋 STATUS BREAKDOWN")
-        for status, count in status_counts:
-            percentage = (count / total_urls) * 100
-            print(f"   {status:15} {count:6,} ({percentage:5.1f}%)")
-        print()
-        
-        # Depth analysis
-        cursor.execute('SELECT depth, COUNT(*), AVG(content_length) FROM crawled_urls GROUP BY depth ORDER BY depth')
-        depth_stats = cursor.fetchall()
-        
-        print(f"📏 DEPTH ANALYSIS")
-        for depth, count, avg_size in depth_stats:
-            print(f"   Depth {depth}: {count:6,} pages (avg: {avg_size or 0:.0f} bytes)")
-        print()
-        
-        # Top domains
-        cursor.execute('''
-            SELECT domain, COUNT(*), AVG(content_length), 
-                   SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) as success_count
-            FROM crawled_urls 
-            WHERE domain IS NOT NULL
-            GROUP BY domain 
-            ORDER BY COUNT(*) DESC 
-            LIMIT 15
-        ''')
-        domain_stats = cursor.fetchall()
-        
-        print(f"🌐 TOP DOMAINS CRAWLED")
-        print(f"   {'Domain':<30} {'Total':<8} {'Success':<8} {'Avg Size':<10}")
-        print(f"   {'-'*30} {'-'*8} {'-'*8} {'-'*10}")
-        for domain, total, avg_size, success in domain_stats:
-            domain_short = domain[:28] + '..' if len(domain) > 30 else domain
-            print(f"   {domain_short:<30} {total:<8,} {success:<8,} {avg_size or 0:<10.0f}")
-        print()
-        
-        # Largest pages
-        cursor.execute('''
-            SELECT url, title, content_length, depth 
-            FROM crawled_urls 
-            WHERE status = 'success' AND content_length > 0
-            ORDER BY content_length DESC 
-            LIMIT 10
-        ''')
-        largest_pages = cursor.fetchall()
-        
-        print(f"📄 LARGEST PAGES FOUND")
-        for i, (url, title, size, depth) in enumerate(largest_pages, 1):
-            title_short = title[:40] + '...' if len(title) > 40 else title
-            url_short = url[:50] + '...' if len(url) > 50 else url
-            print(f"   {i:2}. [{depth}] {title_short}")
-            print(f"       {url_short} ({size:,} bytes)")
-        print()
-        
-        # Error analysis
-        cursor.execute('''
-            SELECT error_message, COUNT(*) 
-            FROM crawled_urls 
-            WHERE status != 'success' AND error_message IS NOT NULL
-            GROUP BY error_message 
-            ORDER BY COUNT(*) DESC 
-            LIMIT 10
-        ''')
-        error_stats = cursor.fetchall()
+        try:
+            for index_name in OBSOLETE_REPORT_INDEXES:
+                conn.execute(f'DROP INDEX IF EXISTS {index_name}')
+            for index_sql in REPORT_INDEXES:
+                conn.execute(index_sql)
+            conn.commit()
+        finally:
+            conn.close()
+        return True
+    except sqlite3.OperationalError:
+        # e.g. read-only directory or a crawler holding the write lock
+        return False
+
+# Independent report queries; run_report_queries() executes them concurrently
+REPORT_QUERIES = {
+    # Single pass grouped by (status, depth); the overall, status and depth
+    # sections are all derived from these rows
+    'status_depth': '''
+        SELECT status, depth, COUNT(*), COUNT(content_length), SUM(content_length)
+        FROM crawled_urls
+        GROUP BY status, depth
+    ''',
+    # Per-domain aggregates; reused for the unique domain count, top domains
+    # and the robots.txt section
+    'domains': '''
+        SELECT domain, COUNT(*) AS total, AVG(content_length),
+               SUM(status = 'success') AS success_count,
+               SUM(status = 'robots_blocked') AS robots_count
+        FROM crawled_urls
+        WHERE domain IS NOT NULL
+        GROUP BY domain
+        ORDER BY total DESC
+    ''',
+    'largest_pages': '''
+        SELECT url, title, content_length, depth 
+        FROM crawled_urls 
+        WHERE status = 'success' AND content_length > 0
+        ORDER BY content_length DESC 
+        LIMIT 10
+    ''',
+    'errors': '''
+        SELECT error_message, COUNT(*) 
+        FROM crawled_urls 
+        WHERE status != 'success' AND error_message IS NOT NULL
+        GROUP BY error_message 
+        ORDER BY COUNT(*) DESC 
+        LIMIT 10
+    ''',
+    'performance': '''
+        SELECT AVG(response_time), MIN(response_time), MAX(response_time)
+        FROM crawled_urls 
+        WHERE status = 'success' AND response_time > 0
+    ''',
+    'links': 'SELECT COUNT(*), COUNT(DISTINCT target_url) FROM discovered_links',
+}
+
+def run_report_queries(db_path: str, max_workers: int = 4) -> Dict[str, List[tuple]]:
+    """
+    Run REPORT_QUERIES concurrently, each on its own connection
+    
+    SQLite allows concurrent readers and sqlite3 releases the GIL while a
+    statement runs, so the scans overlap their I/O and VM work.
+    
+    Args:
+        db_path: Path to SQLite database file
+        max_workers: Number of reader threads
         
-        if error_stats:
-            print(f"❌ COMMON ERRORS")
-            for error, count in error_stats:
-                error_short = error[:60] + '...' if len(error) > 60 else error
-                print(f"   {count:4,}x {error_short}")
+    Returns:
+        Dict[str, List[tuple]]: All result rows, keyed by query name
+    """
+    def fetch(sql):
+        conn = connect_database(db_path)
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {name: pool.submit(fetch, sql) for name, sql in REPORT_QUERIES.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def analyze_database(db_path: str):
+    """Analyze crawl results and generate detailed statistics"""
+    
+    # Collect the report in memory and write it out in one call instead of
+    # locking and flushing stdout on every print()
+    report = io.StringIO()
+    
+    try:
+        with redirect_stdout(report):
+            print("=" * 60)
+            print("PARALLEL WEB CRAWLER - ANALYSIS REPORT")
+            print("=" * 60)
+            print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"Database: {db_path}")
             print()
-        
-        # Robots.txt analysis
-        cursor.execute("SELECT COUNT(*) FROM crawled_urls WHERE status = 'robots_blocked'")
-        robots_blocked = cursor.fetchone()[0]
-        
-        if robots_blocked > 0:
-            print(f"🤖 ROBOTS.TXT COMPLIANCE")
-            print(f"   URLs blocked by robots.txt: {robots_blocked:,}")
             
-            cursor.execute('''
-                SELECT domain, COUNT(*) 
-                FROM crawled_urls 
-                WHERE status = 'robots_blocked' 
-                GROUP BY domain 
-                ORDER BY COUNT(*) DESC 
-                LIMIT 5
-            ''')
-            robots_domains = cursor.fetchall()
+            # Indexes backing the report queries
+            create_report_indexes(db_path)
+            
+            results = run_report_queries(db_path)
+            
+            status_totals = defaultdict(int)
+            depth_totals = defaultdict(lambda: [0, 0, 0])  # [pages, sized pages, bytes]
+            success_pages = 0
+            total_content = 0
             
-            print(f"   Top domains with robots.txt blocks:")
-            for domain, count in robots_domains:
-                print(f"     {domain}: {count:,} blocks")
+            for status, depth, count, sized, size_sum in results['status_depth']:
+                size_sum = size_sum or 0
+                status_totals[status] += count
+                
+                depth_entry = depth_totals[depth]
+                depth_entry[0] += count
+                depth_entry[1] += sized
+                depth_entry[2] += size_sum
+                
+                if status == 'success':
+                    success_pages += sized
+                    total_content += size_sum
+            
+            total_urls = sum(status_totals.values())
+            avg_content_length = total_content / success_pages if success_pages else 0
+            
+            all_domain_stats = results['domains']
+            unique_domains = len(all_domain_stats)
+            
+            print(f"📊 OVERALL STATISTICS")
+            print(f"   Total URLs processed: {total_urls:,}")
+            print(f"   Unique domains: {unique_domains:,}")
+            print(f"   Average page size: {avg_content_length:.0f} bytes")
+            print(f"   Total content crawled: {total_content / (1024*1024):.2f} MB")
             print()
-        
-        # Performance metrics
-        cursor.execute('''
-            SELECT AVG(response_time), MIN(response_time), MAX(response_time)
-            FROM crawled_urls 
-            WHERE status = 'success' AND response_time > 0
-        ''')
-        perf_stats = cursor.fetchone()
-        
-        if perf_stats and perf_stats[0]:
-            avg_time, min_time, max_time = perf_stats
-            print(f"⚡ PERFORMANCE METRICS")
-            print(f"   Average response time: {avg_time:.2f}s")
-            print(f"   Fastest response: {min_time:.2f}s")
-            print(f"   Slowest response: {max_time:.2f}s")
+            
+            # Status breakdown
+            status_counts = sorted(status_totals.items(), key=lambda item: item[1], reverse=True)
+            
+            print(f"📋 STATUS BREAKDOWN")
+            for status, count in status_counts:
+                percentage = (count / total_urls) * 100
+                print(f"   {status:15} {count:6,} ({percentage:5.1f}%)")
             print()
-        
-        # Link discovery stats
-        cursor.execute('SELECT COUNT(*) FROM discovered_links')
-        total_links = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(DISTINCT target_url) FROM discovered_links')
-        unique_links = cursor.fetchone()[0]
-        
-        if total_links > 0:
-            print(f"🔗 LINK DISCOVERY")
-            print(f"   Total links discovered: {total_links:,}")
-            print(f"   Unique links found: {unique_links:,}")
+            
+            # Depth analysis
+            print(f"📏 DEPTH ANALYSIS")
+            for depth in sorted(depth_totals):
+                count, sized, size_sum = depth_totals[depth]
+                avg_size = size_sum / sized if sized else 0
+                print(f"   Depth {depth}: {count:6,} pages (avg: {avg_size:.0f} bytes)")
             print()
-        
-        conn.close()
-        
-        print("=" * 60)
-        print("Analysis complete!")
-        
+            
+            # Top domains
+            domain_stats = all_domain_stats[:15]
+            
+            print(f"🌐 TOP DOMAINS CRAWLED")
+            print(f"   {'Domain':<30} {'Total':<8} {'Success':<8} {'Avg Size':<10}")
+            print(f"   {'-'*30} {'-'*8} {'-'*8} {'-'*10}")
+            for domain, total, avg_size, success, _ in domain_stats:
+                domain_short = domain[:28] + '..' if len(domain) > 30 else domain
+                print(f"   {domain_short:<30} {total:<8,} {success:<8,} {avg_size or 0:<10.0f}")
+            print()
+            
+            # Largest pages
+            largest_pages = results['largest_pages']
+            
+            print(f"📄 LARGEST PAGES FOUND")
+            for i, (url, title, size, depth) in enumerate(largest_pages, 1):
+                title_short = title[:40] + '...' if len(title) > 40 else title
+                url_short = url[:50] + '...' if len(url) > 50 else url
+                print(f"   {i:2}. [{depth}] {title_short}")
+                print(f"       {url_short} ({size:,} bytes)")
+            print()
+            
+            # Error analysis
+            error_stats = results['errors']
+            
+            if error_stats:
+                print(f"❌ COMMON ERRORS")
+                for error, count in error_stats:
+                    error_short = error[:60] + '...' if len(error) > 60 else error
+                    print(f"   {count:4,}x {error_short}")
+                print()
+            
+            # Robots.txt analysis
+            robots_blocked = status_totals.get('robots_blocked', 0)
+            
+            if robots_blocked > 0:
+                print(f"🤖 ROBOTS.TXT COMPLIANCE")
+                print(f"   URLs blocked by robots.txt: {robots_blocked:,}")
+                
+                robots_domains = sorted(
+                    ((row[0], row[4]) for row in all_domain_stats if row[4]),
+                    key=lambda item: item[1],
+                    reverse=True
+                )[:5]
+                
+                print(f"   Top domains with robots.txt blocks:")
+                for domain, count in robots_domains:
+                    print(f"     {domain}: {count:,} blocks")
+                print()
+            
+            # Performance metrics
+            perf_stats = results['performance'][0]
+            
+            if perf_stats and perf_stats[0]:
+                avg_time, min_time, max_time = perf_stats
+                print(f"⚡ PERFORMANCE METRICS")
+                print(f"   Average response time: {avg_time:.2f}s")
+                print(f"   Fastest response: {min_time:.2f}s")
+                print(f"   Slowest response: {max_time:.2f}s")
+                print()
+            
+            # Link discovery stats
+            total_links, unique_links = results['links'][0]
+            
+            if total_links > 0:
+                print(f"🔗 LINK DISCOVERY")
+                print(f"   Total links discovered: {total_links:,}")
+                print(f"   Unique links found: {unique_links:,}")
+                print()
+            
+            print("=" * 60)
+            print("Analysis complete!")
+            
     except Exception as e:
+        sys.stdout.write(report.getvalue())
         print(f"Error analyzing database: {e}")
         return 1
     
+    sys.stdout.write(report.getvalue())
     return 0
 
 def export_results(db_path: str, output_format: str = 'csv'):
     """Export crawl results to various formats"""
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = connect_database(db_path)
         
         if output_format == 'csv':
             import csv
             
             output_file = 'crawl_results.csv'
             cursor = conn.cursor()
+            cursor.arraysize = EXPORT_BATCH_SIZE
             cursor.execute('''
                 SELECT url, title, content_length, status, depth, timestamp, domain, response_time
                 FROM crawled_urls 
@@ -201,37 +328,42 @@ def export_results(db_path: str, output_format: str = 'csv'):
             
             with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
-                writer.writerow(['url', 'title', 'content_length', 'status', 'depth', 'timestamp', 'domain', 'response_time'])
-                writer.writerows(cursor.fetchall())
+                writer.writerow(EXPORT_COLUMNS)
+                
+                # Stream rows in batches instead of materializing the whole table
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    writer.writerows(rows)
             
             print(f"Results exported to {output_file}")
         
         elif output_format == 'json':
-            import json
-            
             output_file = 'crawl_results.json'
             cursor = conn.cursor()
+            cursor.arraysize = EXPORT_BATCH_SIZE
             cursor.execute('''
                 SELECT url, title, content_length, status, depth, timestamp, domain, response_time
                 FROM crawled_urls 
                 ORDER BY timestamp
             ''')
             
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'url': row[0],
-                    'title': row[1],
-                    'content_length': row[2],
-                    'status': row[3],
-                    'depth': row[4],
-                    'timestamp': row[5],
-                    'domain': row[6],
-                    'response_time': row[7]
-                })
-            
+            # Write the array incrementally, one batch of rows at a time; the
+            # output matches json.dump(results, indent=2) without holding all rows
+            encode = json.JSONEncoder(ensure_ascii=False).encode
             with open(output_file, 'w', encoding='utf-8') as jsonfile:
-                json.dump(results, jsonfile, indent=2, ensure_ascii=False)
+                separator = '[\n  '
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    for row in rows:
+                        jsonfile.write(separator)
+                        jsonfile.write(JSON_RECORD_TEMPLATE % tuple(map(encode, row)))
+                        separator = ',\n  '
+                
+                jsonfile.write('[]' if separator == '[\n  ' else '\n]')
             
             print(f"Results exported to {output_file}")
         
@@ -256,10 +388,8 @@ def main():
         print("Error: Database file not specified")
         return 1
     
-    exit_code = 0
-    
-    if args.analyze:
-        exit_code = analyze_database(args.db)
+    # --analyze is kept for compatibility; the report is always shown
+    exit_code = analyze_database(args.db)
     
     if args.export and exit_code == 0:
         exit_code = export_results(args.db, args.export)
@@ -3,43 +3,53 @@
 Configuration management script for the Parallel Web Crawler
 """
 
+import copy
 import json
 import argparse
 import sys
 from pathlib import Path
 
-def create_default_config():
-    """Create a default configuration file"""
-    default_config = {
-        "crawling": {
-            "max_depth": 2,
-            "crawl_delay": 1.0,
-            "request_timeout": 10,
-            "max_urls_per_domain": 100,
-            "respect_robots_txt": True,
-            "verify_ssl": False
-        },
-        "request_settings": {
-            "user_agent": "Mozilla/5.0 (compatible; AdvancedParallelCrawler/1.0)",
-            "max_redirects": 5
-        },
-        "storage": {
-            "database_path": "crawler.db",
-            "urls_file": "urls.txt"
-        },
-        "filters": {
-            "allowed_schemes": ["http", "https"],
-            "blocked_extensions": [".pdf", ".jpg", ".jpeg", ".png", ".gif", ".mp4", ".avi", ".zip", ".tar", ".gz"],
-            "blocked_domains": [],
-            "max_url_length": 2000
-        }
+# Default configuration written by --create and used as the interactive baseline
+DEFAULT_CONFIG = {
+    "crawling": {
+        "max_depth": 2,
+        "crawl_delay": 1.0,
+        "request_timeout": 10,
+        "max_urls_per_domain": 100,
+        "respect_robots_txt": True,
+        "verify_ssl": False
+    },
+    "request_settings": {
+        "user_agent": "Mozilla/5.0 (compatible; AdvancedParallelCrawler/1.0)",
+        "max_redirects": 5
+    },
+    "storage": {
+        "database_path": "crawler.db",
+        "urls_file": "urls.txt"
+    },
+    "filters": {
+        "allowed_schemes": ["http", "https"],
+        "blocked_extensions": [".pdf", ".jpg", ".jpeg", ".png", ".gif", ".mp4", ".avi", ".zip", ".tar", ".gz"],
+        "blocked_domains": [],
+        "max_url_length": 2000
     }
+}
+
+# Pre-serialized default configuration, so saving it skips json.dump
+DEFAULT_CONFIG_JSON = json.dumps(DEFAULT_CONFIG, indent=4, ensure_ascii=False).encode('utf-8')
+
+def create_config_template():
+    """Create a fresh copy of the default configuration"""
+    return copy.deepcopy(DEFAULT_CONFIG)
 
 def save_config(config, filepath):
     """Save configuration to file"""
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
+        if config == DEFAULT_CONFIG:
+            Path(filepath).write_bytes(DEFAULT_CONFIG_JSON)
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=4, ensure_ascii=False)
         print(f"Configuration saved to {filepath}")
         return True
     except Exception as e:
@@ -59,39 +69,36 @@ def load_config(filepath):
         print(f"Error loading configuration: {e}")
         return None
 
+# Sections every configuration file must contain
+REQUIRED_SECTIONS = ['crawling', 'request_settings', 'filters', 'storage']
+
+# Value checks as (section, key, default if missing, validity predicate, error message);
+# a check only runs when its section is present
+CONFIG_CHECKS = [
+    ('crawling', 'max_depth', 0, lambda v: v >= 0, "max_depth must be non-negative"),
+    ('crawling', 'crawl_delay', 0, lambda v: v >= 0, "crawl_delay must be non-negative"),
+    ('crawling', 'request_timeout', 0, lambda v: v > 0, "request_timeout must be positive"),
+    ('crawling', 'max_urls_per_domain', 0, lambda v: v > 0, "max_urls_per_domain must be positive"),
+    ('storage', 'database_path', None, bool, "database_path cannot be empty"),
+    ('storage', 'urls_file', None, bool, "urls_file cannot be empty"),
+]
+
 def validate_config(config):
     """Validate configuration settings"""
     errors = []
     
     # Check required sections
-    required_sections = ['crawling', 'request_settings', 'filters', 'storage']
-    for section in required_sections:
+    for section in REQUIRED_SECTIONS:
         if section not in config:
             errors.append(f"Missing required section: {section}")
     
-    if 'crawling' in config:
-        crawling = config['crawling']
-        
-        if crawling.get('max_depth', 0) < 0:
-            errors.append("max_depth must be non-negative")
-        
-        if crawling.get('crawl_delay', 0) < 0:
-            errors.append("crawl_delay must be non-negative")
-        
-        if crawling.get('request_timeout', 0) <= 0:
-            errors.append("request_timeout must be positive")
-        
-        if crawling.get('max_urls_per_domain', 0) <= 0:
-            errors.append("max_urls_per_domain must be positive")
-    
-    if 'storage' in config:
-        storage = config['storage']
-        
-        if not storage.get('database_path'):
-            errors.append("database_path cannot be empty")
+    for section_name, key, default, is_valid, message in CONFIG_CHECKS:
+        section = config.get(section_name)
+        if section is None:
+            continue
         
-        if not storage.get('urls_file'):
-            errors.append("urls_file cannot be empty")
+        if not is_valid(section.get(key, default)):
+            errors.append(message)
     
     return errors
 
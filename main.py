@@ -14,16 +14,30 @@ from src.database_manager import DatabaseManager
 from src.config import CrawlerConfig
 from src.utils import setup_logging
 
-def signal_handler(signum, frame):
-    """Handle graceful shutdown on SIGINT"""
-    print(f"\nProcess {MPI.COMM_WORLD.Get_rank()} received interrupt signal. Shutting down gracefully...")
-    sys.exit(0)
+def install_signal_handlers(rank: int, coordinator: MPICoordinator):
+    """
+    Route SIGINT through the master so shutdown is coordinated over MPI
+    
+    Args:
+        rank: MPI process rank
+        coordinator: Coordinator that owns the stop flag
+    """
+    if rank != 0:
+        # Workers are stopped by the master's termination message
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        return
+    
+    def handle_sigint(signum, frame):
+        """Handle graceful shutdown on SIGINT"""
+        print(f"\nProcess {rank} received interrupt signal. Shutting down gracefully...")
+        coordinator.request_stop()
+        # A second interrupt aborts immediately
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    
+    signal.signal(signal.SIGINT, handle_sigint)
 
 def main():
     """Main entry point for the parallel web crawler"""
-    # Set up signal handling
-    signal.signal(signal.SIGINT, signal_handler)
-    
     # Initialize MPI
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
@@ -39,18 +53,22 @@ def main():
     # Set up logging
     logger = setup_logging(rank)
     
-    # Load configuration
-    config = CrawlerConfig()
+    # Load configuration on the master and share it so every rank runs
+    # with an identical copy
+    config = CrawlerConfig() if rank == 0 else None
+    config = comm.bcast(config, root=0)
     
     logger.info(f"Process {rank} starting (total processes: {size})")
     
     start_time = time.time()
+    db_manager = None
     
     try:
         # Initialize components
         db_manager = DatabaseManager(config.database_path) if rank == 0 else None
         crawler_core = CrawlerCore(config)
         coordinator = MPICoordinator(comm, rank, size, config, logger)
+        install_signal_handlers(rank, coordinator)
         
         # Run the appropriate process
         if rank == 0:
@@ -69,6 +87,9 @@ def main():
         logger.error(f"Process {rank} encountered error: {e}")
         return 1
     finally:
+        if db_manager is not None:
+            db_manager.close()
+        
         # Ensure all processes synchronize before exit
         try:
             comm.Barrier()
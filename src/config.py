@@ -3,11 +3,83 @@ Configuration management for the Parallel Web Crawler
 """
 
 import os
-from dataclasses import dataclass
-from typing import Set
-from urllib.parse import urlparse
+import sys
+from dataclasses import dataclass, field
+from typing import FrozenSet, NamedTuple, Optional, Tuple
 
-@dataclass
+# Default URL filtering rules
+DEFAULT_ALLOWED_EXTENSIONS = frozenset({
+    '.html', '.htm', '.php', '.asp', '.aspx', '.jsp', 
+    '.py', '.rb', '.pl', ''  # empty for pages without extension
+})
+
+DEFAULT_BLOCKED_EXTENSIONS = frozenset({
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.zip', '.rar', '.7z', '.tar', '.gz',
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.ico',
+    '.mp3', '.mp4', '.wav', '.avi', '.mov', '.wmv',
+    '.exe', '.msi', '.deb', '.rpm', '.dmg'
+})
+
+DEFAULT_ALLOWED_PROTOCOLS = frozenset({'http', 'https'})
+
+class ParsedURL(NamedTuple):
+    """URL components extracted once and shared along the crawl pipeline"""
+    scheme: str
+    domain: str
+    path: str
+
+def _split_url(url: str) -> Tuple[str, str, str]:
+    """
+    Extract the lowercased scheme and domain and the path from a URL
+    
+    A lightweight stand-in for urlparse() on the URL filter hot path; the
+    components are cut the same way urlparse() does (no query, fragment
+    or ;params on the last path segment) without building a ParseResult.
+    
+    Args:
+        url: URL to split
+        
+    Returns:
+        Tuple[str, str, str]: (scheme, domain, path); scheme is '' if the URL has none
+    """
+    url = url.lstrip()
+    i = url.find(':')
+    if i <= 0:
+        return '', '', ''
+    scheme = url[:i].lower()
+    rest = url[i + 1:]
+    
+    # The authority ends at the first '/', '?' or '#'
+    start = 0
+    domain = ''
+    if rest.startswith('//'):
+        start = len(rest)
+        for delim in '/?#':
+            j = rest.find(delim, 2)
+            if 0 <= j < start:
+                start = j
+        domain = rest[2:start].lower()
+    
+    # The path ends at the query or fragment
+    end = len(rest)
+    for delim in '?#':
+        j = rest.find(delim, start)
+        if 0 <= j < end:
+            end = j
+    path = rest[start:end]
+    
+    # Drop ;params from the last path segment
+    j = path.find(';', path.rfind('/') + 1)
+    if j >= 0:
+        path = path[:j]
+    
+    return scheme, domain, path
+
+# __slots__ support for dataclasses needs Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class CrawlerConfig:
     """Configuration settings for the web crawler"""
     
@@ -17,7 +89,7 @@ class CrawlerConfig:
     
     # Crawling parameters
     max_depth: int = 2
-    crawl_delay: float = 1.0  # seconds between requests per worker
+    crawl_delay: float = 1.0  # seconds between requests to the same domain
     request_timeout: int = 10  # seconds
     max_urls_per_domain: int = 50
     
@@ -25,35 +97,34 @@ class CrawlerConfig:
     user_agent: str = "Mozilla/5.0 (compatible; ParallelCrawler/1.0)"
     verify_ssl: bool = False
     max_redirects: int = 5
+    max_content_length: int = 5 * 1024 * 1024  # bytes; larger responses are skipped
+    pool_connections: int = 100  # hosts whose keep-alive connections are kept
+    pool_maxsize: int = 10  # idle connections kept per host
     
     # Robots.txt compliance
     respect_robots_txt: bool = True
     robots_cache_duration: int = 3600  # seconds
+    robots_failure_cache_duration: int = 300  # seconds, when robots.txt could not be fetched
     
     # Allowed file extensions and protocols
-    allowed_extensions: Set[str] = None
-    blocked_extensions: Set[str] = None
-    allowed_protocols: Set[str] = None
+    # (read-only; plain sets passed in are converted to frozensets)
+    allowed_extensions: FrozenSet[str] = DEFAULT_ALLOWED_EXTENSIONS
+    blocked_extensions: FrozenSet[str] = DEFAULT_BLOCKED_EXTENSIONS
+    allowed_protocols: FrozenSet[str] = DEFAULT_ALLOWED_PROTOCOLS
+    
+    # Derived lookup structures, filled in by __post_init__
+    _blocked_ext_tuple: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _allowed_ext_tuple: Tuple[str, ...] = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        """Initialize default values after dataclass creation"""
-        if self.allowed_extensions is None:
-            self.allowed_extensions = {
-                '.html', '.htm', '.php', '.asp', '.aspx', '.jsp', 
-                '.py', '.rb', '.pl', ''  # empty for pages without extension
-            }
-        
-        if self.blocked_extensions is None:
-            self.blocked_extensions = {
-                '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
-                '.zip', '.rar', '.7z', '.tar', '.gz',
-                '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.ico',
-                '.mp3', '.mp4', '.wav', '.avi', '.mov', '.wmv',
-                '.exe', '.msi', '.deb', '.rpm', '.dmg'
-            }
+        """Freeze rule sets and build derived lookup structures after dataclass creation"""
+        # The instance is frozen, so assign through object.__setattr__
+        for name in ('allowed_extensions', 'blocked_extensions', 'allowed_protocols'):
+            object.__setattr__(self, name, frozenset(getattr(self, name)))
         
-        if self.allowed_protocols is None:
-            self.allowed_protocols = {'http', 'https'}
+        # Suffix tuples for str.endswith, which checks every extension in one call
+        object.__setattr__(self, '_blocked_ext_tuple', tuple(self.blocked_extensions))
+        object.__setattr__(self, '_allowed_ext_tuple', tuple(self.allowed_extensions))
     
     def is_url_allowed(self, url: str) -> bool:
         """
@@ -65,32 +136,46 @@ class CrawlerConfig:
         Returns:
             bool: True if URL is allowed, False otherwise
         """
+        return self.parse_and_check(url) is not None
+    
+    def parse_and_check(self, url: str) -> Optional[ParsedURL]:
+        """
+        Parse a URL and check it against configuration rules in one pass
+        
+        Callers that also need the domain should use this instead of
+        is_url_allowed() so the URL is only split once.
+        
+        Args:
+            url: The URL to check
+            
+        Returns:
+            ParsedURL: Parsed components if the URL is allowed, None otherwise
+        """
         try:
-            parsed = urlparse(url.lower())
+            scheme, domain, path = _split_url(url)
             
             # Check protocol
-            if parsed.scheme not in self.allowed_protocols:
-                return False
+            if scheme not in self.allowed_protocols:
+                return None
             
             # Check file extension
-            path = parsed.path.lower()
+            lower_path = path.lower()
             
             # Check for blocked extensions
-            for ext in self.blocked_extensions:
-                if path.endswith(ext):
-                    return False
+            if lower_path.endswith(self._blocked_ext_tuple):
+                return None
             
             # If we have allowed extensions, ensure URL matches one of them
-            if self.allowed_extensions:
-                if not any(path.endswith(ext) for ext in self.allowed_extensions):
+            if self._allowed_ext_tuple:
+                if not lower_path.endswith(self._allowed_ext_tuple):
                     # Special case: allow URLs without file extensions
-                    if '.' in os.path.basename(path):
-                        return False
+                    if '.' in os.path.basename(lower_path):
+                        return None
             
-            return True
+            return ParsedURL(scheme, domain, path)
             
         except Exception:
-            return False
+            return None
     
     @classmethod
     def from_file(cls, config_path: str) -> 'CrawlerConfig':
@@ -2,21 +2,43 @@
 Core web crawling functionality for the Parallel Web Crawler
 """
 
+import codecs
+import functools
+import re
 import time
+import threading
 import requests
 from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+from urllib3.util import make_headers
 from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin
-from typing import Dict, Any, Set, Optional
+import lxml.html
+from lxml import etree
+from urllib.parse import urljoin
+from urllib.robotparser import RobotFileParser
+from typing import Dict, Any, Set, Optional, Tuple
 import urllib3
 
-from .utils import normalize_url, extract_links_from_html, clean_text, get_domain_from_url
-from .config import CrawlerConfig
+from .utils import normalize_url, normalize_links, clean_text, get_domain_from_url, RobotsRules
+from .config import CrawlerConfig, ParsedURL
 
 # Suppress SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Bytes read from a streamed response body at a time
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Byte order marks lxml detects on its own
+HTML_BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+# A <meta charset> or http-equiv Content-Type declaration near the top of
+# a page, which lxml also honors when no encoding is given
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset', re.IGNORECASE)
+
+# Leading bytes of a page searched for a charset declaration and probed
+# for UTF-8; the rest of the body is left to the parser
+ENCODING_SNIFF_BYTES = 4096
+
 class CrawlerCore:
     """
     Core web crawling functionality with rate limiting and robots.txt compliance
@@ -31,16 +53,31 @@ class CrawlerCore:
         """
         self.config = config
         self.session = requests.Session()
-        self.robots_cache = {}  # Cache for robots.txt parsers
+        self.robots_cache = {}  # domain -> (compiled robots.txt rules or None, fetched_at)
+        self.robots_lock = threading.Lock()  # One robots.txt fetch per domain at a time
         self.last_request_time = {}  # Track last request time per domain
         
-        # Configure session
+        # Memoize URL rule checks; the same links recur on every page of a
+        # site and the config they depend on is immutable
+        self._parse_and_check = functools.lru_cache(maxsize=65536)(config.parse_and_check)
+        
+        # Product token matched against robots.txt User-agent lines
+        ua_tokens = config.user_agent.split()
+        self._ua_token = ua_tokens[0] if ua_tokens else '*'
+        
+        # Configure session; advertise every compression urllib3 can decode
+        # here (br/zstd when brotli/zstandard are installed)
         self.session.headers.update({
-            'User-Agent': config.user_agent
+            'User-Agent': config.user_agent,
+            'Accept': 'text/html,application/xhtml+xml,*/*;q=0.8',
+            'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']
         })
         
-        # Configure session settings
+        # Configure session settings; the pool keeps one keep-alive pool per
+        # host, so size it for the number of distinct hosts being crawled
         adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
             max_retries=Retry(
                 total=2,
                 backoff_factor=0.5,
@@ -62,7 +99,10 @@ class CrawlerCore:
             Dict[str, Any]: Crawling result with metadata
         """
         start_time = time.time()
-        domain = get_domain_from_url(url)
+        
+        # Parse once; the filter result also provides the domain
+        parsed = self._parse_and_check(url)
+        domain = parsed.domain if parsed else get_domain_from_url(url)
         
         # Initialize result structure
         result = {
@@ -80,7 +120,7 @@ class CrawlerCore:
         
         try:
             # Check if URL is allowed by configuration
-            if not self.config.is_url_allowed(url):
+            if parsed is None:
                 result['error_message'] = 'URL blocked by configuration'
                 result['status'] = 'blocked'
                 return result
@@ -89,51 +129,62 @@ class CrawlerCore:
             self._enforce_rate_limit(domain)
             
             # Check robots.txt compliance
-            if self.config.respect_robots_txt and not self._is_robots_allowed(url):
+            if self.config.respect_robots_txt and not self._is_robots_allowed(url, parsed):
                 result['error_message'] = 'Blocked by robots.txt'
                 result['status'] = 'robots_blocked'
                 return result
             
-            # Make HTTP request
+            # Make HTTP request, streaming so oversized bodies are never fully read
             response = self.session.get(
                 url,
                 timeout=self.config.request_timeout,
                 verify=self.config.verify_ssl,
                 allow_redirects=True,
-                stream=False
+                stream=True
             )
             
-            # Check for successful response
-            response.raise_for_status()
+            try:
+                # Check for successful response
+                response.raise_for_status()
+                content = self._read_body(response)
+            finally:
+                response.close()
+            
+            if content is None:
+                result['error_message'] = f'Content larger than {self.config.max_content_length} bytes'
+                result['status'] = 'too_large'
+                return result
             
             # Extract content information
-            content = response.content
             result['content_length'] = len(content)
             
             # Parse HTML content
             if 'text/html' in response.headers.get('content-type', '').lower():
-                soup = BeautifulSoup(content, 'html.parser')
+                # Parse once with lxml on the raw bytes, in the charset the
+                # page was served with; title and links both come from this tree
+                try:
+                    doc = lxml.html.document_fromstring(content, parser=self._html_parser(response, content))
+                except etree.ParserError:
+                    doc = None  # Empty document
                 
                 # Extract title
-                title_tag = soup.find('title')
-                if title_tag:
-                    result['title'] = clean_text(title_tag.get_text(), max_length=200)
+                title = doc.findtext('.//title') if doc is not None else None
+                if title is not None:
+                    result['title'] = clean_text(title, max_length=200)
                 else:
                     result['title'] = 'No Title Found'
                 
                 # Extract links if not at max depth
-                if depth < self.config.max_depth:
+                if depth < self.config.max_depth and doc is not None:
                     try:
-                        raw_html = response.text
-                        discovered_links = extract_links_from_html(raw_html, url)
+                        discovered_links = normalize_links(doc.xpath('//@href'), url)
                         
                         # Filter and validate links
-                        valid_links = set()
-                        for link in discovered_links:
-                            if self.config.is_url_allowed(link):
-                                valid_links.add(link)
-                        
-                        result['links'] = valid_links
+                        check = self._parse_and_check
+                        result['links'] = {
+                            link for link in discovered_links
+                            if check(link) is not None
+                        }
                         
                     except Exception as e:
                         # Link extraction failed, but crawling succeeded
@@ -156,10 +207,86 @@ class CrawlerCore:
         
         return result
     
+    def _html_parser(self, response: requests.Response, content: bytes) -> lxml.html.HTMLParser:
+        """
+        Build an HTML parser for a body in the encoding it was served with
+        
+        A BOM wins, then the Content-Type charset, both as in HTML encoding
+        sniffing. Without either, lxml is left to read a <meta charset>
+        itself; failing that, UTF-8 is used when the start of the body
+        decodes as UTF-8, since lxml would otherwise assume Latin-1.
+        
+        Args:
+            response: Response the body was read from
+            content: Raw response body
+            
+        Returns:
+            lxml.html.HTMLParser: Parser for the body
+        """
+        # lxml reads the BOM itself
+        if content.startswith(HTML_BOMS):
+            return lxml.html.HTMLParser()
+        
+        # requests reports ISO-8859-1 for any text/* type without a
+        # charset, so only trust it when the header names one
+        if 'charset' in response.headers.get('content-type', '').lower():
+            encoding = get_encoding_from_headers(response.headers)
+            if encoding:
+                try:
+                    return lxml.html.HTMLParser(encoding=encoding)
+                except LookupError:
+                    pass  # Charset lxml does not know; detect as if none was given
+        
+        if META_CHARSET_PATTERN.search(content, 0, ENCODING_SNIFF_BYTES):
+            return lxml.html.HTMLParser()
+        
+        # Probe only the start of the body; an incremental decoder accepts a
+        # multibyte sequence cut off at the end of the probe
+        probe = content[:ENCODING_SNIFF_BYTES]
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(probe, final=len(content) <= len(probe))
+            return lxml.html.HTMLParser(encoding='utf-8')
+        except UnicodeDecodeError:
+            return lxml.html.HTMLParser()
+    
+    def _read_body(self, response: requests.Response) -> Optional[bytes]:
+        """
+        Read a streamed response body, stopping at the configured size limit
+        
+        Args:
+            response: Response opened with stream=True
+            
+        Returns:
+            Optional[bytes]: Decoded body, or None if it exceeds max_content_length
+        """
+        limit = self.config.max_content_length
+        
+        # Reject up front when the server declares an oversized body
+        declared = response.headers.get('content-length', '')
+        if declared.isdigit() and int(declared) > limit:
+            return None
+        
+        # Count decoded bytes, so compressed bodies cannot expand past the limit
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            received += len(chunk)
+            if received > limit:
+                return None
+            chunks.append(chunk)
+        
+        return b''.join(chunks)
+    
     def _enforce_rate_limit(self, domain: str):
         """
         Enforce rate limiting per domain
         
+        Under the MPI coordinator, work items already arrive spaced by the
+        crawl delay, so this rarely sleeps. It stays as the limit for
+        standalone use, and keeps the delay when a prefetched item started
+        late behind a slow fetch, leaving the next one for the same domain
+        less than the delay after it.
+        
         Args:
             domain: Domain to check rate limit for
         """
@@ -171,46 +298,94 @@ class CrawlerCore:
         
         self.last_request_time[domain] = time.time()
     
-    def _is_robots_allowed(self, url: str) -> bool:
+    def _is_robots_allowed(self, url: str, parsed: Optional[ParsedURL] = None) -> bool:
         """
         Check if URL is allowed by robots.txt
         
         Args:
             url: URL to check
+            parsed: Already parsed form of url, to avoid splitting it again
             
         Returns:
             bool: True if allowed, False otherwise
         """
         try:
-            from urllib.robotparser import RobotFileParser
-            
-            parsed = urlparse(url)
-            domain = f"{parsed.scheme}://{parsed.netloc}"
-            
-            # Check cache first
-            if domain not in self.robots_cache:
-                robots_url = urljoin(domain, '/robots.txt')
-                rp = RobotFileParser()
-                rp.set_url(robots_url)
-                
-                try:
-                    rp.read()
-                    self.robots_cache[domain] = rp
-                except Exception:
-                    # If we can't fetch robots.txt, assume allowed
-                    self.robots_cache[domain] = None
+            if parsed is None:
+                parsed = self._parse_and_check(url)
+                if parsed is None:
+                    # Not a crawlable URL, so there are no rules to apply
                     return True
+            domain = f"{parsed.scheme}://{parsed.domain}"
+            
+            # Check cache first, re-fetching once the entry has expired
+            entry = self.robots_cache.get(domain)
+            if self._robots_entry_expired(entry):
+                with self.robots_lock:
+                    # Another thread may have fetched it while we waited
+                    entry = self.robots_cache.get(domain)
+                    if self._robots_entry_expired(entry):
+                        entry = (self._fetch_robots(domain), time.monotonic())
+                        self.robots_cache[domain] = entry
             
-            robots_parser = self.robots_cache[domain]
-            if robots_parser is None:
+            robots_rules = entry[0]
+            if robots_rules is None:
+                # If we can't fetch robots.txt, assume allowed
                 return True
             
-            return robots_parser.can_fetch(self.config.user_agent.split()[0], url)
+            return robots_rules.can_fetch(url)
             
         except Exception:
             # On any error, assume allowed
             return True
     
+    def _fetch_robots(self, domain: str) -> Optional[RobotsRules]:
+        """
+        Download robots.txt for a domain and compile its rules for our user agent
+        
+        Args:
+            domain: Scheme and host, e.g. "https://example.com"
+            
+        Returns:
+            Optional[RobotsRules]: Compiled rules, or None if robots.txt could not be fetched
+        """
+        rp = RobotFileParser()
+        rp.set_url(urljoin(domain, '/robots.txt'))
+        
+        try:
+            rp.read()
+        except Exception:
+            return None
+        
+        # read() does not raise on a 5xx reply; it leaves the parser unread,
+        # which would block the whole domain, so treat it as a failed fetch
+        if not (rp.disallow_all or rp.allow_all or rp.mtime()):
+            return None
+        
+        return RobotsRules(rp, self._ua_token)
+    
+    def _robots_entry_expired(self, entry: Optional[Tuple[Optional[RobotsRules], float]]) -> bool:
+        """
+        Check if a robots.txt cache entry is missing or too old to use
+        
+        Failed fetches expire sooner so unreachable robots.txt files are retried.
+        
+        Args:
+            entry: Cached (rules, fetched_at) pair, or None if not cached
+            
+        Returns:
+            bool: True if robots.txt should be fetched again
+        """
+        if entry is None:
+            return True
+        
+        robots_rules, fetched_at = entry
+        if robots_rules is None:
+            ttl = self.config.robots_failure_cache_duration
+        else:
+            ttl = self.config.robots_cache_duration
+        
+        return time.monotonic() - fetched_at > ttl
+    
     def validate_url(self, url: str) -> bool:
         """
         Validate if a URL should be crawled
@@ -222,20 +397,14 @@ class CrawlerCore:
             bool: True if URL is valid and should be crawled
         """
         try:
-            # Basic URL validation
-            parsed = urlparse(url)
-            if not parsed.scheme or not parsed.netloc:
-                return False
-            
-            # Check allowed protocols
-            if parsed.scheme not in self.config.allowed_protocols:
+            # Check allowed protocols and configuration rules; the cached
+            # result covers repeated checks of the same URL
+            parsed = self._parse_and_check(url)
+            if parsed is None:
                 return False
             
-            # Check configuration rules
-            if not self.config.is_url_allowed(url):
-                return False
-            
-            return True
+            # Basic URL validation
+            return bool(parsed.domain)
             
         except Exception:
             return False
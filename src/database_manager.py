@@ -4,14 +4,57 @@ Database management for the Parallel Web Crawler using SQLite
 
 import sqlite3
 import threading
+import time
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
 
+# Applied to every new connection: WAL lets readers run alongside the
+# writer, and the larger cache/mmap keep hot pages out of read() calls
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA mmap_size=268435456',
+)
+
+# Retries for a write that still finds the database locked after the
+# connection's busy timeout, with exponential backoff between attempts
+WRITE_RETRIES = 3
+WRITE_RETRY_DELAY = 0.1  # seconds
+
+# Crawl results update in place on re-crawl so the row keeps its id
+# (UPSERT needs SQLite 3.24+); one literal so every call reuses the
+# connection's cached prepared statement
+INSERT_CRAWL_RESULT_SQL = '''
+    INSERT INTO crawled_urls 
+    (url, title, content_length, status, depth, domain, response_time, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        title = excluded.title,
+        content_length = excluded.content_length,
+        status = excluded.status,
+        depth = excluded.depth,
+        domain = excluded.domain,
+        response_time = excluded.response_time,
+        error_message = excluded.error_message,
+        timestamp = CURRENT_TIMESTAMP
+'''
+
+INSERT_LINK_SQL = '''
+    INSERT OR IGNORE INTO discovered_links 
+    (source_url, target_url, depth)
+    VALUES (?, ?, ?)
+'''
+
+# Rows fetched per round trip when exporting
+EXPORT_BATCH_SIZE = 10000
+
 class DatabaseManager:
     """
     Manages SQLite database operations for the web crawler
-    Thread-safe with connection pooling
+    Thread-safe, with one persistent connection per thread
     """
     
     def __init__(self, db_path: str):
@@ -22,7 +65,9 @@ class DatabaseManager:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
-        self.lock = threading.Lock()
+        self._local = threading.local()  # Holds each thread's connection
+        self._connections = []  # Every open connection, for close()
+        self._connections_lock = threading.Lock()
         self._init_database()
     
     def _init_database(self):
@@ -43,20 +88,40 @@ class DatabaseManager:
                 )
             ''')
             
+            # The UNIQUE constraint on url already keeps an index on it; a
+            # second one only doubles the B-tree work on every insert
             conn.execute('''
-                CREATE INDEX IF NOT EXISTS idx_url ON crawled_urls(url)
+                DROP INDEX IF EXISTS idx_url
             ''')
             
+            # Per-domain counts and sizes are read from this index alone;
+            # it replaces the single-column domain index, a prefix of it
+            conn.execute('''
+                DROP INDEX IF EXISTS idx_domain
+            ''')
+            conn.execute('''
+                DROP INDEX IF EXISTS idx_domain_status
+            ''')
             conn.execute('''
-                CREATE INDEX IF NOT EXISTS idx_domain ON crawled_urls(domain)
+                CREATE INDEX IF NOT EXISTS idx_domain_size ON crawled_urls(domain, status, content_length)
             ''')
             
+            # Serves both GROUP BY status and status/depth breakdowns from the
+            # index; replaces the single-column status index, a prefix of it
             conn.execute('''
-                CREATE INDEX IF NOT EXISTS idx_status ON crawled_urls(status)
+                DROP INDEX IF EXISTS idx_status
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_status_depth ON crawled_urls(status, depth)
             ''')
             
+            # Depth breakdowns with their sizes, read from the index alone;
+            # replaces the single-column depth index, a prefix of it
             conn.execute('''
-                CREATE INDEX IF NOT EXISTS idx_depth ON crawled_urls(depth)
+                DROP INDEX IF EXISTS idx_depth
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_depth_status ON crawled_urls(depth, status, content_length)
             ''')
             
             # Table for tracking discovered links
@@ -81,22 +146,99 @@ class DatabaseManager:
             
             conn.commit()
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open and configure a new database connection
+        
+        Returns:
+            sqlite3.Connection: Database connection
+        """
+        # close() may run on a different thread than the one that opened it
+        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        
+        with self._connections_lock:
+            self._connections.append(conn)
+        
+        return conn
+    
     @contextmanager
-    def get_connection(self):
+    def get_connection(self, row_factory=None):
         """
-        Get a database connection with automatic cleanup
+        Get this thread's database connection, opening it on first use
+        
+        The connection stays open for reuse; an uncommitted transaction is
+        rolled back if the block raises.
+        
+        Args:
+            row_factory: Row factory for this block, e.g. sqlite3.Row for
+                dict-like access; rows are plain tuples by default
         
         Yields:
             sqlite3.Connection: Database connection
         """
-        conn = None
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        
+        conn.row_factory = row_factory
+        
         try:
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
-            conn.row_factory = sqlite3.Row  # Enable dict-like row access
             yield conn
-        finally:
-            if conn:
-                conn.close()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def _execute_write(self, sql: str, params=(), many: bool = False) -> int:
+        """
+        Run a write statement in its own transaction
+        
+        Args:
+            sql: SQL statement to run
+            params: Statement parameters, or a sequence of them if many is True
+            many: Run the statement once per parameter set with executemany
+            
+        Returns:
+            int: Number of rows modified
+        """
+        return self._execute_writes([(sql, params, many)])
+    
+    def _execute_writes(self, statements: List[Tuple[str, Any, bool]]) -> int:
+        """
+        Run several write statements in a single transaction
+        
+        SQLite serializes writers itself, so no Python-level lock is taken;
+        the transaction is retried if the database stays locked.
+        
+        Args:
+            statements: (sql, params, many) triples, as taken by _execute_write
+            
+        Returns:
+            int: Number of rows modified
+        """
+        delay = WRITE_RETRY_DELAY
+        for attempt in range(WRITE_RETRIES):
+            try:
+                with self.get_connection() as conn:
+                    # Take the write lock up front instead of upgrading mid-transaction
+                    conn.execute('BEGIN IMMEDIATE')
+                    rowcount = 0
+                    for sql, params, many in statements:
+                        if many:
+                            cursor = conn.executemany(sql, params)
+                        else:
+                            cursor = conn.execute(sql, params)
+                        rowcount += max(cursor.rowcount, 0)
+                    conn.commit()
+                    return rowcount
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or attempt == WRITE_RETRIES - 1:
+                    raise
+                time.sleep(delay)
+                delay *= 2
     
     def insert_crawl_result(self, result: Dict[str, Any]) -> bool:
         """
@@ -105,32 +247,75 @@ class DatabaseManager:
         Args:
             result: Dictionary containing crawl result data
             
+        Returns:
+            bool: True if insertion successful, False otherwise
+        """
+        return self.insert_crawl_results([result])
+    
+    def insert_crawl_results(self, results: List[Dict[str, Any]]) -> bool:
+        """
+        Insert a batch of crawl results in a single transaction
+        
+        Args:
+            results: Dictionaries containing crawl result data
+            
         Returns:
             bool: True if insertion successful, False otherwise
         """
         try:
-            with self.lock:
-                with self.get_connection() as conn:
-                    conn.execute('''
-                        INSERT OR REPLACE INTO crawled_urls 
-                        (url, title, content_length, status, depth, domain, response_time, error_message)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        result.get('url'),
-                        result.get('title'),
-                        result.get('content_length', 0),
-                        result.get('status'),
-                        result.get('depth', 0),
-                        result.get('domain'),
-                        result.get('response_time', 0.0),
-                        result.get('error_message')
-                    ))
-                    conn.commit()
+            self._execute_write(INSERT_CRAWL_RESULT_SQL, self._crawl_result_rows(results), many=True)
             return True
         except Exception as e:
             print(f"Database insert error: {e}")
             return False
     
+    def insert_crawl_batch(self, results: List[Dict[str, Any]],
+                           links: List[Tuple[str, str, int]]) -> bool:
+        """
+        Insert crawl results and discovered links in a single transaction
+        
+        Args:
+            results: Dictionaries containing crawl result data
+            links: (source_url, target_url, depth) rows for discovered links
+            
+        Returns:
+            bool: True if insertion successful, False otherwise
+        """
+        try:
+            self._execute_writes([
+                (INSERT_CRAWL_RESULT_SQL, self._crawl_result_rows(results), True),
+                (INSERT_LINK_SQL, links, True)
+            ])
+            return True
+        except Exception as e:
+            print(f"Database batch insert error: {e}")
+            return False
+    
+    @staticmethod
+    def _crawl_result_rows(results: List[Dict[str, Any]]) -> List[Tuple]:
+        """
+        Build crawled_urls rows for INSERT_CRAWL_RESULT_SQL
+        
+        Args:
+            results: Dictionaries containing crawl result data
+            
+        Returns:
+            List[Tuple]: One parameter tuple per result
+        """
+        return [
+            (
+                result.get('url'),
+                result.get('title'),
+                result.get('content_length', 0),
+                result.get('status'),
+                result.get('depth', 0),
+                result.get('domain'),
+                result.get('response_time', 0.0),
+                result.get('error_message')
+            )
+            for result in results
+        ]
+    
     def insert_discovered_links(self, source_url: str, target_urls: List[str], depth: int) -> bool:
         """
         Insert discovered links into database
@@ -144,15 +329,11 @@ class DatabaseManager:
             bool: True if insertion successful, False otherwise
         """
         try:
-            with self.lock:
-                with self.get_connection() as conn:
-                    for target_url in target_urls:
-                        conn.execute('''
-                            INSERT OR IGNORE INTO discovered_links 
-                            (source_url, target_url, depth)
-                            VALUES (?, ?, ?)
-                        ''', (source_url, target_url, depth))
-                    conn.commit()
+            # One statement for the whole batch, committed as a single transaction;
+            # rows are built up front so a retry can replay them
+            self._execute_write(INSERT_LINK_SQL, [
+                (source_url, target_url, depth) for target_url in target_urls
+            ], many=True)
             return True
         except Exception as e:
             print(f"Database link insert error: {e}")
@@ -183,7 +364,7 @@ class DatabaseManager:
             Dict[str, Any]: Dictionary with crawling statistics
         """
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(row_factory=sqlite3.Row) as conn:
                 stats = {}
                 
                 # Total URLs crawled
@@ -244,7 +425,9 @@ class DatabaseManager:
             import csv
             
             with self.get_connection() as conn:
-                cursor = conn.execute('''
+                cursor = conn.cursor()
+                cursor.arraysize = EXPORT_BATCH_SIZE
+                cursor.execute('''
                     SELECT url, title, content_length, status, depth, timestamp, domain, response_time
                     FROM crawled_urls 
                     ORDER BY timestamp
@@ -259,9 +442,12 @@ class DatabaseManager:
                         'depth', 'timestamp', 'domain', 'response_time'
                     ])
                     
-                    # Write data
-                    for row in cursor:
-                        writer.writerow(row)
+                    # Write data in batches rather than one writerow() call per row
+                    while True:
+                        rows = cursor.fetchmany()
+                        if not rows:
+                            break
+                        writer.writerows(rows)
             
             return True
             
@@ -280,23 +466,31 @@ class DatabaseManager:
             int: Number of entries removed
         """
         try:
-            with self.lock:
-                with self.get_connection() as conn:
-                    cursor = conn.execute('''
-                        DELETE FROM crawled_urls 
-                        WHERE timestamp < datetime('now', '-{} days')
-                    '''.format(days_old))
-                    
-                    deleted_count = cursor.rowcount
-                    conn.commit()
-                    
-                    return deleted_count
-                    
+            deleted_count = self._execute_write('''
+                DELETE FROM crawled_urls 
+                WHERE timestamp < datetime('now', '-{} days')
+            '''.format(days_old))
+            
+            return deleted_count
+            
         except Exception as e:
             print(f"Database cleanup error: {e}")
             return 0
     
     def close(self):
         """Close database connections and cleanup"""
-        # SQLite connections are closed automatically by context manager
-        pass
+        with self._connections_lock:
+            # Refresh planner statistics now that the crawl has filled the
+            # tables; optimize only analyzes what has changed and caps the work
+            if self._connections:
+                try:
+                    self._connections[0].execute('PRAGMA optimize')
+                except sqlite3.Error as e:
+                    print(f"Database optimize error: {e}")
+            
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        
+        # Threads that use the manager again get a fresh connection
+        self._local = threading.local()
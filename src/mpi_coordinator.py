@@ -3,9 +3,14 @@ MPI Coordinator for the Parallel Web Crawler
 Handles master-worker coordination and communication
 """
 
+import sys
 import time
+import heapq
+import struct
+import queue
 import logging
-from typing import Set, List, Dict, Any, Optional, Tuple
+import threading
+from typing import Set, List, Dict, Any, Optional, Tuple, Iterable
 from collections import defaultdict, deque
 from mpi4py import MPI
 from urllib.parse import urlparse
@@ -15,12 +20,323 @@ from .config import CrawlerConfig
 from .database_manager import DatabaseManager
 from .crawler_core import CrawlerCore
 
+# Work and results travel as compact byte frames over Comm.Send/Recv rather
+# than as pickled objects; an empty work frame tells a worker to stop
+WORK_HEADER = struct.Struct('<id')  # depth, seconds to wait; the URL bytes follow
+RESULT_HEADER = struct.Struct('<qidd')  # content_length, depth, response_time, timestamp
+STOP_FRAME = b''
+NONE_LENGTH = 0xFFFFFFFF  # String length that encodes None
+
+# Results and links are written to the database in batches, flushed once
+# enough results have accumulated or the oldest has waited long enough
+DB_BATCH_SIZE = 100
+DB_FLUSH_INTERVAL = 1.0  # seconds
+
+# Work items each worker may hold at once: the one it is crawling plus one
+# already waiting in its receive queue, so it does not idle while the
+# master handles its previous result
+WORKER_PREFETCH = 2
+
+def _pack_strings(values: List[Optional[str]]) -> bytes:
+    """
+    Pack strings as a count, their byte lengths, then the UTF-8 data
+    
+    Args:
+        values: Strings to pack; None is preserved
+        
+    Returns:
+        bytes: Packed strings
+    """
+    encoded = [b'' if value is None else value.encode('utf-8', 'surrogatepass') for value in values]
+    lengths = [
+        NONE_LENGTH if value is None else len(data)
+        for value, data in zip(values, encoded)
+    ]
+    return struct.pack(f'<I{len(lengths)}I', len(lengths), *lengths) + b''.join(encoded)
+
+def _unpack_strings(frame: bytes, offset: int) -> Tuple[List[Optional[str]], int]:
+    """
+    Unpack strings written by _pack_strings
+    
+    Args:
+        frame: Buffer holding the packed strings
+        offset: Position of the packed strings in frame
+        
+    Returns:
+        Tuple[List[Optional[str]], int]: Unpacked strings and the offset just past them
+    """
+    (count,) = struct.unpack_from('<I', frame, offset)
+    lengths = struct.unpack_from(f'<{count}I', frame, offset + 4)
+    
+    position = offset + 4 + 4 * count
+    values = []
+    for length in lengths:
+        if length == NONE_LENGTH:
+            values.append(None)
+            continue
+        values.append(frame[position:position + length].decode('utf-8', 'surrogatepass'))
+        position += length
+    
+    return values, position
+
+def pack_result(result: Dict[str, Any]) -> bytes:
+    """
+    Encode a crawl result as a byte frame for the master
+    
+    Args:
+        result: Crawling result dictionary
+        
+    Returns:
+        bytes: Encoded result
+    """
+    header = RESULT_HEADER.pack(
+        result.get('content_length', 0),
+        result.get('depth', 0),
+        result.get('response_time', 0.0),
+        result.get('timestamp', 0.0)
+    )
+    fields = _pack_strings([
+        result.get('url'),
+        result.get('title'),
+        result.get('status'),
+        result.get('domain'),
+        result.get('error_message')
+    ])
+    
+    # Links go last as one newline-separated block, so decoding them is a
+    # single split; a link containing a newline is not a usable URL
+    links = list(result.get('links', ()))
+    joined = '\n'.join(links)
+    if joined.count('\n') != max(len(links) - 1, 0):
+        joined = '\n'.join(link for link in links if '\n' not in link)
+    
+    return header + fields + joined.encode('utf-8', 'surrogatepass')
+
+def unpack_result(frame: bytes) -> Dict[str, Any]:
+    """
+    Decode a crawl result frame built by pack_result
+    
+    Args:
+        frame: Encoded result
+        
+    Returns:
+        Dict[str, Any]: Crawling result dictionary
+    """
+    content_length, depth, response_time, timestamp = RESULT_HEADER.unpack_from(frame)
+    fields, offset = _unpack_strings(frame, RESULT_HEADER.size)
+    url, title, status, domain, error_message = fields
+    links = frame[offset:].decode('utf-8', 'surrogatepass')
+    
+    return {
+        'url': url,
+        'title': title,
+        'content_length': content_length,
+        'status': status,
+        'depth': depth,
+        'domain': domain,
+        'response_time': response_time,
+        'error_message': error_message,
+        'links': set(links.split('\n')) if links else set(),
+        'timestamp': timestamp
+    }
+
 class WorkItem:
     """Represents a work item for crawling"""
-    def __init__(self, url: str, depth: int):
+    
+    # The master can hold many queued items; slots keep each one small
+    __slots__ = ('url', 'depth', 'domain', 'timestamp', 'not_before')
+    
+    def __init__(self, url: str, depth: int, domain: str = ''):
         self.url = url
         self.depth = depth
+        self.domain = domain
         self.timestamp = time.time()
+        self.not_before = 0.0  # Time, on this process's clock, the fetch may start
+    
+    def to_bytes(self) -> bytes:
+        """
+        Encode the fields a worker needs as a byte frame
+        
+        not_before travels as a delay relative to now, since the clocks of
+        ranks on different nodes need not agree.
+        
+        Returns:
+            bytes: Encoded work item
+        """
+        delay = max(self.not_before - time.time(), 0.0)
+        return WORK_HEADER.pack(self.depth, delay) + self.url.encode('utf-8', 'surrogatepass')
+    
+    @classmethod
+    def from_bytes(cls, frame: bytes) -> 'WorkItem':
+        """
+        Decode a work item frame built by to_bytes, turning its delay into
+        a deadline on the local clock
+        
+        Args:
+            frame: Encoded work item
+            
+        Returns:
+            WorkItem: Decoded work item
+        """
+        depth, delay = WORK_HEADER.unpack_from(frame)
+        work_item = cls(frame[WORK_HEADER.size:].decode('utf-8', 'surrogatepass'), depth)
+        work_item.not_before = time.time() + delay
+        return work_item
+
+class DomainFrontier:
+    """
+    Work queue that rotates between domains to honor the crawl delay
+    
+    URLs are queued per domain, and a heap orders the domains by when they
+    may next be requested, so taking the next URL is O(log D) in the number
+    of domains instead of a scan over queued URLs.
+    """
+    
+    def __init__(self, crawl_delay: float):
+        """
+        Initialize an empty frontier
+        
+        Args:
+            crawl_delay: Seconds between requests to the same domain
+        """
+        self.crawl_delay = crawl_delay
+        self._queues: Dict[str, deque] = {}  # Pending work items per domain
+        self._ready: List[Tuple[float, int, str]] = []  # (next_ok, seq, domain) heap
+        self._next_ok: Dict[str, float] = {}  # Next allowed request time per domain
+        self._seq = 0  # Tie-breaker keeping equal times in insertion order
+        self._size = 0
+    
+    def __len__(self) -> int:
+        """Number of queued work items"""
+        return self._size
+    
+    def append(self, work_item: WorkItem):
+        """
+        Queue a work item behind others for the same domain
+        
+        Args:
+            work_item: Work item to queue
+        """
+        queue = self._queues.get(work_item.domain)
+        if queue is None:
+            # Domain becomes schedulable once its crawl delay has passed
+            queue = self._queues[work_item.domain] = deque()
+            self._push(work_item.domain)
+        
+        queue.append(work_item)
+        self._size += 1
+    
+    def pop(self) -> WorkItem:
+        """
+        Take a URL from the domain that is ready soonest
+        
+        If no domain is ready yet, the work item's not_before tells the
+        worker how long to wait instead of the master blocking.
+        
+        Returns:
+            WorkItem: Work item, with not_before set
+        """
+        ready, _, domain = heapq.heappop(self._ready)
+        queue = self._queues[domain]
+        work_item = queue.popleft()
+        self._size -= 1
+        
+        # Reserve the domain's next slot
+        work_item.not_before = max(time.time(), ready)
+        self._next_ok[domain] = work_item.not_before + self.crawl_delay
+        
+        if queue:
+            self._push(domain)
+        else:
+            del self._queues[domain]
+        
+        return work_item
+    
+    def next_ready(self) -> float:
+        """Time the soonest ready domain may next be requested"""
+        return self._ready[0][0]
+    
+    def clear(self):
+        """Drop all queued work items"""
+        self._queues.clear()
+        self._ready.clear()
+        self._size = 0
+    
+    def _push(self, domain: str):
+        """Schedule a domain with queued work at its next allowed time"""
+        heapq.heappush(self._ready, (self._next_ok.get(domain, 0.0), self._seq, domain))
+        self._seq += 1
+
+class WorkerSlots:
+    """
+    Work slots of each worker, handed out to the least loaded worker first
+    
+    A worker holds at most `depth` work items at once. Free slots are
+    grouped by how many items their worker already holds, so a worker with
+    nothing to do always gets work before one that is still crawling.
+    """
+    
+    def __init__(self, ranks: Iterable[int], depth: int):
+        """
+        Initialize with every worker idle
+        
+        Args:
+            ranks: Worker ranks
+            depth: Work items a worker may hold at once
+        """
+        self.depth = depth
+        self._load: Dict[int, int] = {}  # Outstanding work items per worker
+        # Workers with a free slot, indexed by their load; dicts keep the
+        # least recently released worker first
+        self._free: List[Dict[int, None]] = [{} for _ in range(depth)]
+        for rank in ranks:
+            self._load[rank] = 0
+            self._free[0][rank] = None
+    
+    def __bool__(self) -> bool:
+        """True if any worker has a free slot"""
+        return any(self._free)
+    
+    def take(self, preferred: Optional[int] = None) -> int:
+        """
+        Reserve a slot on one of the least loaded workers
+        
+        Args:
+            preferred: Worker to pick if it is among the least loaded
+            
+        Returns:
+            int: Rank of the worker whose slot was reserved
+        """
+        for load, workers in enumerate(self._free):
+            if workers:
+                rank = preferred if preferred in workers else next(iter(workers))
+                del workers[rank]
+                self._load[rank] = load + 1
+                if load + 1 < self.depth:
+                    self._free[load + 1][rank] = None
+                return rank
+        raise IndexError('no free worker slots')
+    
+    def release(self, rank: int):
+        """
+        Free a slot after the worker has returned a result
+        
+        Args:
+            rank: Rank of the worker
+        """
+        load = self._load[rank]
+        if load < self.depth:
+            del self._free[load][rank]
+        self._load[rank] = load - 1
+        self._free[load - 1][rank] = None
+    
+    def is_idle(self, rank: int) -> bool:
+        """True if the worker holds no work items"""
+        return self._load[rank] == 0
+    
+    def has_idle(self) -> bool:
+        """True if any worker holds no work items"""
+        return bool(self._free[0])
 
 class MPICoordinator:
     """
@@ -44,14 +360,30 @@ class MPICoordinator:
         self.config = config
         self.logger = logger
         
+        # Set when a shutdown has been requested (e.g. SIGINT on the master)
+        self.stop_requested = threading.Event()
+        
         # Master-specific data structures
         if rank == 0:
-            self.visited_urls: Set[str] = set()
-            self.work_queue: deque = deque()
+            # 64-bit hash() fingerprints of queued or crawled URLs rather than
+            # the strings themselves; only the master computes them, so they
+            # are consistent for the whole run
+            self.visited_urls: Set[int] = set()
+            self.work_queue = DomainFrontier(config.crawl_delay)
             self.active_workers: Set[int] = set()
             self.domain_counts: Dict[str, int] = defaultdict(int)
+            self.capped_domains: Set[str] = set()  # Domains at max_urls_per_domain
+            self.domain_workers: Dict[str, int] = {}  # domain -> worker it was last sent to
             self.total_processed = 0
             self.start_time = time.time()
+            
+            # Database writes are handed to a writer thread so the master
+            # can keep serving workers while SQLite commits
+            self.db_queue: queue.Queue = queue.Queue()
+            self.db_writer: Optional[threading.Thread] = None
+            self._pending_results: List[Dict[str, Any]] = []
+            self._pending_links: List[Tuple[str, str, int]] = []
+            self._last_flush = time.time()
     
     def run_master(self, db_manager: DatabaseManager, crawler_core: CrawlerCore):
         """
@@ -75,47 +407,51 @@ class MPICoordinator:
             
             # Initialize work queue with seed URLs
             for url in seed_urls:
-                if url not in self.visited_urls:
-                    self.work_queue.append(WorkItem(url, 0))
-                    self.visited_urls.add(url)
+                fingerprint = hash(url)
+                if fingerprint not in self.visited_urls:
+                    self.work_queue.append(WorkItem(url, 0, get_domain_from_url(url) or ''))
+                    self.visited_urls.add(fingerprint)
             
             # Track statistics
             urls_sent = 0
             results_received = 0
             
+            # Work slots of every worker
+            worker_slots = WorkerSlots(range(1, self.size), WORKER_PREFETCH)
+            
+            self._start_db_writer(db_manager)
+            
             # Initial work distribution
-            for worker_rank in range(1, min(self.size, len(self.work_queue) + 1)):
-                if self.work_queue:
-                    work_item = self.work_queue.popleft()
-                    self.comm.send(work_item, dest=worker_rank, tag=0)
-                    self.active_workers.add(worker_rank)
-                    urls_sent += 1
-                    self.logger.info(f"Sent initial URL to worker {worker_rank}: {work_item.url}")
+            urls_sent += self._dispatch_work(worker_slots)
             
             # Main coordination loop
-            while results_received < urls_sent or self.work_queue:
+            while results_received < urls_sent:
                 # Receive results from any worker
-                status = MPI.Status()
-                result = self.comm.recv(source=MPI.ANY_SOURCE, tag=1, status=status)
-                worker_rank = status.Get_source()
+                frame, worker_rank = self._recv_frame(source=MPI.ANY_SOURCE, tag=1)
+                result = unpack_result(frame)
                 results_received += 1
+                worker_slots.release(worker_rank)
+                if worker_slots.is_idle(worker_rank):
+                    self.active_workers.discard(worker_rank)
+                
+                # On shutdown, stop handing out work; the loop then only
+                # drains results that are still in flight
+                if self.stop_requested.is_set() and self.work_queue:
+                    self.logger.warning(
+                        f"Stop requested, discarding {len(self.work_queue)} queued URLs "
+                        f"and waiting for {urls_sent - results_received} in-flight results"
+                    )
+                    self.work_queue.clear()
+                
+                # Hand out queued work before processing, so the worker is
+                # not idle while this result is filtered and stored
+                urls_sent += self._dispatch_work(worker_slots)
                 
                 # Process result
                 self._process_result(result, db_manager)
                 
-                # Send next work item if available
-                if self.work_queue:
-                    work_item = self.work_queue.popleft()
-                    self.comm.send(work_item, dest=worker_rank, tag=0)
-                    urls_sent += 1
-                    self.logger.info(f"Sent URL to worker {worker_rank}: {work_item.url} (depth {work_item.depth})")
-                else:
-                    # No more work, remove from active workers
-                    self.active_workers.discard(worker_rank)
-                    
-                    # Send termination signal if no more work
-                    if not self.work_queue and worker_rank in self.active_workers:
-                        self.comm.send(None, dest=worker_rank, tag=0)
+                # Links from this result may keep waiting workers busy
+                urls_sent += self._dispatch_work(worker_slots)
                 
                 # Log progress periodically
                 if results_received % 10 == 0:
@@ -124,12 +460,20 @@ class MPICoordinator:
             # Terminate all workers
             self._terminate_all_workers()
             
-            # Final statistics
+            # Final statistics, once every queued write has landed
+            self._flush_db_writes(db_manager)
+            self._stop_db_writer()
             self._log_final_stats(db_manager)
             
         except Exception as e:
             self.logger.error(f"Master process error: {e}")
             self._terminate_all_workers()
+            self._flush_db_writes(db_manager)
+            self._stop_db_writer()
+    
+    def request_stop(self):
+        """Ask the master to wind down the crawl and terminate the workers"""
+        self.stop_requested.set()
     
     def run_worker(self, crawler_core: CrawlerCore):
         """
@@ -145,20 +489,28 @@ class MPICoordinator:
         try:
             while True:
                 # Receive work item from master
-                work_item = self.comm.recv(source=0, tag=0)
+                frame, _ = self._recv_frame(source=0, tag=0)
                 
                 # Check for termination signal
-                if work_item is None:
+                if not frame:
                     self.logger.info(f"Worker {self.rank} received termination signal")
                     break
                 
+                work_item = WorkItem.from_bytes(frame)
+                
+                # Wait out the domain's crawl delay if the master could not
+                # find a domain that was ready
+                wait = work_item.not_before - time.time()
+                if wait > 0:
+                    time.sleep(wait)
+                
                 self.logger.info(f"Worker {self.rank} processing: {work_item.url} (depth {work_item.depth})")
                 
                 # Crawl the URL
                 result = crawler_core.crawl_url(work_item.url, work_item.depth)
                 
                 # Send result back to master
-                self.comm.send(result, dest=0, tag=1)
+                self._send_frame(pack_result(result), dest=0, tag=1)
                 
                 urls_processed += 1
                 self.logger.info(f"Worker {self.rank} completed: {work_item.url} [{result['status']}]")
@@ -168,6 +520,36 @@ class MPICoordinator:
         finally:
             self.logger.info(f"Worker {self.rank} finished after processing {urls_processed} URLs")
     
+    def _send_frame(self, frame: bytes, dest: int, tag: int):
+        """
+        Send a byte frame as a raw MPI buffer
+        
+        Args:
+            frame: Bytes to send
+            dest: Destination rank
+            tag: Message tag
+        """
+        self.comm.Send([frame, MPI.BYTE], dest=dest, tag=tag)
+    
+    def _recv_frame(self, source: int, tag: int) -> Tuple[bytes, int]:
+        """
+        Receive a byte frame of any length into a buffer sized by probing
+        
+        Args:
+            source: Source rank, or MPI.ANY_SOURCE
+            tag: Message tag
+            
+        Returns:
+            Tuple[bytes, int]: Received bytes and the rank that sent them
+        """
+        status = MPI.Status()
+        self.comm.Probe(source=source, tag=tag, status=status)
+        source = status.Get_source()
+        
+        frame = bytearray(status.Get_count(MPI.BYTE))
+        self.comm.Recv([frame, MPI.BYTE], source=source, tag=tag)
+        return frame, source
+    
     def _load_seed_urls(self) -> List[str]:
         """
         Load and validate seed URLs from file
@@ -177,7 +559,7 @@ class MPICoordinator:
         """
         try:
             with open(self.config.urls_file, 'r') as f:
-                urls = [line.strip() for line in f if line.strip()]
+                urls = [url for url in map(str.strip, f) if url]
             
             # Validate and normalize URLs
             valid_urls = validate_seed_urls(urls)
@@ -192,6 +574,109 @@ class MPICoordinator:
             self.logger.error(f"Error loading seed URLs: {e}")
             return []
     
+    def _dispatch_work(self, worker_slots: WorkerSlots) -> int:
+        """
+        Send queued work items to workers with free slots
+        
+        Args:
+            worker_slots: Work slots of every worker; used slots are reserved
+            
+        Returns:
+            int: Number of work items sent
+        """
+        sent = 0
+        while worker_slots and self.work_queue and not self.stop_requested.is_set():
+            # A work item that must still wait out its domain's crawl delay
+            # only goes to an idle worker; in a prefetch slot it would wait
+            # behind the worker's current fetch and then for the full delay
+            if not worker_slots.has_idle() and self.work_queue.next_ready() > time.time():
+                break
+            
+            work_item = self.work_queue.pop()
+            
+            # Idle workers come first; among equally loaded ones, prefer the
+            # worker that last crawled this domain, so its cached robots.txt
+            # and pooled connections to the host are reused
+            worker_rank = worker_slots.take(self.domain_workers.get(work_item.domain))
+            self.domain_workers[work_item.domain] = worker_rank
+            
+            self._send_frame(work_item.to_bytes(), dest=worker_rank, tag=0)
+            self.active_workers.add(worker_rank)
+            sent += 1
+            self.logger.info(f"Sent URL to worker {worker_rank}: {work_item.url} (depth {work_item.depth})")
+        
+        return sent
+    
+    def _start_db_writer(self, db_manager: DatabaseManager):
+        """
+        Start the thread that performs queued database writes
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        self.db_writer = threading.Thread(
+            target=self._run_db_writer,
+            args=(db_manager,),
+            name='db-writer',
+            daemon=True
+        )
+        self.db_writer.start()
+    
+    def _run_db_writer(self, db_manager: DatabaseManager):
+        """
+        Perform queued database writes until a None sentinel arrives
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        while True:
+            task = self.db_queue.get()
+            if task is None:
+                break
+            
+            write, args = task
+            try:
+                write(*args)
+            except Exception as e:
+                self.logger.error(f"Database writer error: {e}")
+    
+    def _stop_db_writer(self):
+        """Wait for queued database writes to finish and stop the writer thread"""
+        if self.db_writer is None:
+            return
+        
+        self.db_queue.put(None)
+        self.db_writer.join()
+        self.db_writer = None
+    
+    def _queue_db_write(self, write, *args):
+        """
+        Run a database write on the writer thread, or inline if it is not running
+        
+        Args:
+            write: DatabaseManager method to call
+            *args: Arguments for the method
+        """
+        if self.db_writer is None:
+            write(*args)
+        else:
+            self.db_queue.put((write, args))
+    
+    def _flush_db_writes(self, db_manager: DatabaseManager):
+        """
+        Write pending results and links to the database in one transaction
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        self._last_flush = time.time()
+        if not self._pending_results and not self._pending_links:
+            return
+        
+        results, self._pending_results = self._pending_results, []
+        links, self._pending_links = self._pending_links, []
+        self._queue_db_write(db_manager.insert_crawl_batch, results, links)
+    
     def _process_result(self, result: Dict[str, Any], db_manager: DatabaseManager):
         """
         Process crawling result from worker
@@ -202,8 +687,8 @@ class MPICoordinator:
         """
         self.total_processed += 1
         
-        # Store result in database
-        db_manager.insert_crawl_result(result)
+        # Store result with the next database batch
+        self._pending_results.append(result)
         
         # Log result
         status = result.get('status', 'unknown')
@@ -215,11 +700,11 @@ class MPICoordinator:
             
             # Process discovered links if not at max depth
             links = result.get('links', set())
-            if links and depth < self.config.max_depth:
+            if links and depth < self.config.max_depth and not self.stop_requested.is_set():
                 new_links = self._filter_and_add_links(links, depth + 1)
                 if new_links:
-                    # Store discovered links in database
-                    db_manager.insert_discovered_links(url, list(new_links), depth + 1)
+                    # Store discovered links with the next database batch
+                    self._pending_links.extend((url, link, depth + 1) for link in new_links)
                     self.logger.info(f"Added {len(new_links)} new links from {url}")
         else:
             self.logger.warning(f"Crawl failed: {url} - {result.get('error_message', 'Unknown error')}")
@@ -228,6 +713,12 @@ class MPICoordinator:
         domain = result.get('domain')
         if domain:
             self.domain_counts[domain] += 1
+            if self.domain_counts[domain] >= self.config.max_urls_per_domain:
+                self.capped_domains.add(domain)
+        
+        if (len(self._pending_results) >= DB_BATCH_SIZE
+                or time.time() - self._last_flush >= DB_FLUSH_INTERVAL):
+            self._flush_db_writes(db_manager)
     
     def _filter_and_add_links(self, links: Set[str], depth: int) -> Set[str]:
         """
@@ -240,37 +731,45 @@ class MPICoordinator:
         Returns:
             Set[str]: Set of newly added URLs
         """
-        new_links = set()
+        # Skip already visited links
+        visited = self.visited_urls
+        candidates = [link for link in links if hash(link) not in visited]
         
-        for link in links:
-            # Skip if already visited
-            if link in self.visited_urls:
-                continue
-            
-            # Check domain limits
-            domain = get_domain_from_url(link)
-            if domain and self.domain_counts[domain] >= self.config.max_urls_per_domain:
-                continue
-            
-            # Validate URL
-            if not self.config.is_url_allowed(link):
-                continue
-            
-            # Add to work queue
-            self.work_queue.append(WorkItem(link, depth))
-            self.visited_urls.add(link)
-            new_links.add(link)
+        # Validate URLs; the parsed form also carries the domain
+        check = self.config.parse_and_check
+        parsed_links = [(link, check(link)) for link in candidates]
+        
+        # Check domain limits; queued items share one string per domain
+        capped = self.capped_domains
+        accepted = [
+            (link, sys.intern(parsed.domain)) for link, parsed in parsed_links
+            if parsed is not None and parsed.domain not in capped
+        ]
+        
+        # Add to work queue
+        for link, domain in accepted:
+            self.work_queue.append(WorkItem(link, depth, domain))
+        
+        new_links = {link for link, _ in accepted}
+        visited.update(map(hash, new_links))
         
         return new_links
     
     def _terminate_all_workers(self):
         """Send termination signals to all workers"""
+        # Post all sends at once rather than one blocking round trip per worker
+        requests = []
         for worker_rank in range(1, self.size):
             try:
-                self.comm.send(None, dest=worker_rank, tag=0)
+                requests.append(self.comm.Isend([STOP_FRAME, MPI.BYTE], dest=worker_rank, tag=0))
             except:
                 pass  # Ignore errors during termination
         
+        try:
+            MPI.Request.waitall(requests)
+        except:
+            pass
+        
         self.logger.info("Termination signals sent to all workers")
     
     def _log_progress(self, results_received: int, urls_sent: int):
@@ -2,12 +2,38 @@
 Utility functions for the Parallel Web Crawler
 """
 
+import functools
 import logging
 import re
-from urllib.parse import urljoin, urlparse, urlunparse
-from typing import Set, List, Optional, Dict, Any
+from urllib.parse import urljoin, urlparse, urlunparse, quote, unquote
+from typing import Set, List, Optional, Dict, Any, Iterable, Tuple
 from urllib.robotparser import RobotFileParser
 
+# Link targets that never lead to crawlable pages
+SKIPPED_LINK_PREFIXES = (
+    'javascript:', 'mailto:', 'tel:', 'ftp:', 'file:',
+    '#', 'data:', 'blob:'
+)
+
+# First characters of those prefixes in either case; other links need no
+# lowered copy to rule them out
+SKIPPED_LINK_FIRST_CHARS = frozenset(
+    char for prefix in SKIPPED_LINK_PREFIXES for char in (prefix[0], prefix[0].upper())
+)
+
+# href attribute values, compiled once
+HREF_PATTERN = re.compile(r'href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+# The common absolute URL, split in one match: ASCII host without brackets,
+# no ;params and no whitespace or control characters. Anything else is left
+# to urlparse, so both paths agree on every input.
+FAST_URL_PATTERN = re.compile(
+    r'(https?)://([^/?#\[\]\s\x00-\x1f\x7f-\U0010ffff]+)'  # scheme, netloc
+    r'(/[^?#;\s\x00-\x1f\x7f]*)?'  # path
+    r'(?:\?([^#\s\x00-\x1f\x7f]*))?'  # query
+    r'(?:#.*)?\Z'  # fragment, dropped
+)
+
 def setup_logging(rank: int, level: int = logging.INFO) -> logging.Logger:
     """
     Set up logging for a specific MPI process
@@ -46,32 +72,43 @@ def normalize_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
         str: Normalized URL or None if invalid
     """
     try:
-        # Handle relative URLs
-        if base_url and not url.startswith(('http://', 'https://')):
-            url = urljoin(base_url, url)
-        
-        # Parse URL
-        parsed = urlparse(url.strip())
-        
-        # Skip non-HTTP(S) URLs
-        if parsed.scheme not in ('http', 'https'):
-            return None
+        # Fast path for plain absolute URLs
+        match = None
+        if url.startswith(('http://', 'https://')):
+            match = FAST_URL_PATTERN.match(url.strip())
         
-        # Skip empty or invalid URLs
-        if not parsed.netloc:
-            return None
-        
-        # Normalize components
-        scheme = parsed.scheme.lower()
-        netloc = parsed.netloc.lower()
-        path = parsed.path
-        query = parsed.query
+        if match:
+            scheme, netloc, path, query = match.groups()
+            netloc = netloc.lower()
+            path = path or ''
+            query = query or ''
+        else:
+            # Handle relative URLs
+            if base_url and not url.startswith(('http://', 'https://')):
+                url = urljoin(base_url, url)
+            
+            # Parse URL
+            parsed = urlparse(url.strip())
+            
+            # Skip non-HTTP(S) URLs
+            if parsed.scheme not in ('http', 'https'):
+                return None
+            
+            # Skip empty or invalid URLs
+            if not parsed.netloc:
+                return None
+            
+            # Normalize components
+            scheme = parsed.scheme.lower()
+            netloc = parsed.netloc.lower()
+            path = parsed.path
+            query = parsed.query
         
         # Remove default ports
-        if ':80' in netloc and scheme == 'http':
-            netloc = netloc.replace(':80', '')
-        elif ':443' in netloc and scheme == 'https':
-            netloc = netloc.replace(':443', '')
+        if scheme == 'http' and netloc.endswith(':80'):
+            netloc = netloc[:-3]
+        elif scheme == 'https' and netloc.endswith(':443'):
+            netloc = netloc[:-4]
         
         # Normalize path (remove trailing slash except for root)
         if path.endswith('/') and len(path) > 1:
@@ -79,16 +116,40 @@ def normalize_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
         elif not path:
             path = '/'
         
-        # Remove fragment (anchor)
-        fragment = ''
-        
-        # Reconstruct normalized URL
-        normalized = urlunparse((scheme, netloc, path, '', query, fragment))
+        # Reconstruct normalized URL, without params or fragment (anchor)
+        normalized = f'{scheme}://{netloc}{path}'
+        if query:
+            normalized += '?' + query
         return normalized
         
     except Exception:
         return None
 
+def normalize_links(hrefs: Iterable[str], base_url: str) -> Set[str]:
+    """
+    Filter out non-page link targets and normalize the rest
+    
+    Args:
+        hrefs: Raw link targets, e.g. href attribute values
+        base_url: Base URL for resolving relative links
+        
+    Returns:
+        Set[str]: Set of normalized URLs
+    """
+    links = set()
+    
+    for href in hrefs:
+        # Skip certain types of links
+        if href[:1] in SKIPPED_LINK_FIRST_CHARS and href.lower().startswith(SKIPPED_LINK_PREFIXES):
+            continue
+        
+        # Normalize and add to set
+        normalized = normalize_url(href, base_url)
+        if normalized:
+            links.add(normalized)
+    
+    return links
+
 def extract_links_from_html(html_content: str, base_url: str) -> Set[str]:
     """
     Extract and normalize all links from HTML content
@@ -104,26 +165,11 @@ def extract_links_from_html(html_content: str, base_url: str) -> Set[str]:
     
     try:
         # Simple regex-based link extraction (more robust than full parsing)
-        # This handles various link formats including those in JavaScript
-        link_patterns = [
-            r'href\s*=\s*["\']([^"\']+)["\']',  # Standard href attributes
-            r'<a\s+[^>]*href\s*=\s*["\']([^"\']+)["\']',  # More specific anchor tags
-        ]
-        
-        for pattern in link_patterns:
-            matches = re.findall(pattern, html_content, re.IGNORECASE)
-            for match in matches:
-                # Skip certain types of links
-                if any(match.lower().startswith(skip) for skip in [
-                    'javascript:', 'mailto:', 'tel:', 'ftp:', 'file:',
-                    '#', 'data:', 'blob:'
-                ]):
-                    continue
-                
-                # Normalize and add to set
-                normalized = normalize_url(match, base_url)
-                if normalized:
-                    links.add(normalized)
+        # This handles various link formats including those in JavaScript;
+        # every href attribute is matched, anchor tags included
+        hrefs = (match.group(1) for match in HREF_PATTERN.finditer(html_content))
+        
+        links = normalize_links(hrefs, base_url)
     
     except Exception as e:
         # Log error but don't fail completely
@@ -171,10 +217,88 @@ def is_robots_allowed(url: str, robots_cache: dict, user_agent: str = '*') -> bo
         # On any error, assume allowed
         return True
 
+class RobotsRules:
+    """
+    robots.txt rules for one user agent, indexed by path prefix
+    
+    Answers the same as RobotFileParser.can_fetch, but finds the first
+    applicable rule with one dict lookup per distinct rule length instead
+    of testing every rule in turn.
+    """
+    
+    __slots__ = ('_verdict', '_rules', '_lengths')
+    
+    def __init__(self, robots_parser: RobotFileParser, user_agent: str):
+        """
+        Index the rules that a parsed robots.txt applies to a user agent
+        
+        Args:
+            robots_parser: Parser that has already read robots.txt
+            user_agent: User agent to select rules for
+        """
+        # Answer given for every URL without looking at the rules, if any
+        self._verdict: Optional[bool] = None
+        if robots_parser.disallow_all:
+            self._verdict = False
+        elif robots_parser.allow_all:
+            self._verdict = True
+        elif not robots_parser.mtime():
+            # Never read, which can_fetch treats as disallowed
+            self._verdict = False
+        
+        # The first entry naming the agent wins, then the default entry
+        entry = next(
+            (entry for entry in robots_parser.entries if entry.applies_to(user_agent)),
+            robots_parser.default_entry
+        )
+        rulelines = entry.rulelines if entry else []
+        if not rulelines and self._verdict is None:
+            self._verdict = True
+        
+        # Path prefix -> (position, allowance) of the first rule with that
+        # prefix; '*' matches every path, like the empty prefix
+        self._rules: Dict[str, Tuple[int, bool]] = {}
+        for position, line in enumerate(rulelines):
+            prefix = '' if line.path == '*' else line.path
+            self._rules.setdefault(prefix, (position, line.allowance))
+        self._lengths = sorted({len(prefix) for prefix in self._rules})
+    
+    def can_fetch(self, url: str) -> bool:
+        """
+        Check if robots.txt allows fetching a URL
+        
+        Args:
+            url: URL to check
+            
+        Returns:
+            bool: True if allowed, False otherwise
+        """
+        if self._verdict is not None:
+            return self._verdict
+        
+        # Reduce the URL to a quoted path, as RobotFileParser.can_fetch does
+        parsed = urlparse(unquote(url))
+        path = quote(urlunparse(('', '', parsed.path, parsed.params, parsed.query, parsed.fragment))) or '/'
+        
+        # Of the rules whose prefix the path starts with, the earliest wins
+        rules = self._rules
+        first = None
+        for length in self._lengths:
+            if length > len(path):
+                break
+            rule = rules.get(path[:length])
+            if rule is not None and (first is None or rule < first):
+                first = rule
+        
+        return True if first is None else first[1]
+
+@functools.lru_cache(maxsize=65536)
 def get_domain_from_url(url: str) -> Optional[str]:
     """
     Extract domain from URL
     
+    Results are cached, since the same URLs are looked up repeatedly.
+    
     Args:
         url: URL to extract domain from
         
@@ -201,8 +325,9 @@ def clean_text(text: str, max_length: int = 500) -> str:
     if not text:
         return ""
     
-    # Remove extra whitespace and newlines
-    cleaned = re.sub(r'\s+', ' ', text.strip())
+    # Remove extra whitespace and newlines; split() treats the same
+    # characters as whitespace as \s does
+    cleaned = ' '.join(text.split())
     
     # Truncate if too long
     if len(cleaned) > max_length:
@@ -220,11 +345,5 @@ def validate_seed_urls(urls: List[str]) -> List[str]:
     Returns:
         List[str]: List of valid normalized URLs
     """
-    valid_urls = []
-    
-    for url in urls:
-        normalized = normalize_url(url.strip())
-        if normalized:
-            valid_urls.append(normalized)
-    
-    return valid_urls
+    # normalize_url strips surrounding whitespace itself
+    return [normalized for normalized in map(normalize_url, urls) if normalized]
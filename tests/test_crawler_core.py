@@ -0,0 +1,72 @@
+"""
+Tests for robots.txt handling in CrawlerCore
+"""
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from src.config import CrawlerConfig
+from src.crawler_core import CrawlerCore
+
+
+class RobotsHandler(BaseHTTPRequestHandler):
+    """Answers every robots.txt request with the server's robots_status"""
+
+    def do_GET(self):
+        self.server.robots_requests += 1
+        self.send_response(self.server.robots_status)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RobotsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RobotsHandler)
+        self.server.robots_requests = 0
+        self.server.robots_status = 503
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.config = CrawlerConfig(crawl_delay=0.0)
+        self.crawler = CrawlerCore(self.config)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/page'
+
+    def test_server_error_is_retried_after_failure_ttl(self):
+        """A 5xx robots.txt allows crawling and is re-fetched after the failure TTL"""
+        now = 1000.0
+        with mock.patch('src.crawler_core.time.monotonic', side_effect=lambda: now):
+            self.assertTrue(self.crawler._is_robots_allowed(self.url))
+            self.assertEqual(self.server.robots_requests, 1)
+
+            # Still cached just before the failure TTL runs out
+            now += self.config.robots_failure_cache_duration - 1
+            self.assertTrue(self.crawler._is_robots_allowed(self.url))
+            self.assertEqual(self.server.robots_requests, 1)
+
+            # Fetched again once it has, well before the normal TTL
+            now += 2
+            self.assertTrue(self.crawler._is_robots_allowed(self.url))
+            self.assertEqual(self.server.robots_requests, 2)
+
+    def test_forbidden_is_cached_for_full_ttl(self):
+        """A 403 robots.txt blocks the domain and keeps the normal TTL"""
+        self.server.robots_status = 403
+        now = 1000.0
+        with mock.patch('src.crawler_core.time.monotonic', side_effect=lambda: now):
+            self.assertFalse(self.crawler._is_robots_allowed(self.url))
+
+            now += self.config.robots_failure_cache_duration + 1
+            self.assertFalse(self.crawler._is_robots_allowed(self.url))
+            self.assertEqual(self.server.robots_requests, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()